@@ -0,0 +1,8 @@
+# Freeze the EuroPiAlt firmware into a MicroPython build for the Pico, so the
+# scripts run as precompiled bytecode from flash instead of being compiled
+# into RAM at import.
+#
+#   make -C ports/rp2 BOARD=PICO FROZEN_MANIFEST=/path/to/EuroPiAlt/manifest.py
+#
+include("$(PORT_DIR)/boards/manifest.py")
+freeze("src")
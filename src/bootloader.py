@@ -5,6 +5,9 @@ Main entrypoint script used to select a script from a list of registered scripts
 
 Hold both buttons for >1 second to stop script and return to the bootloader.
 """
+import gc
+
+from micropython import const
 from utime import sleep_ms
 import uasyncio as asyncio
 
@@ -14,6 +17,7 @@ from lib.europi import button_2
 from lib.europi import digital_outputs
 from lib.clock import Clock
 from lib.button import Pushbutton
+from lib.helpers import reset_triggers
 from lib.ui import display_choice
 from lib.ui import digital_off
 from lib.ui import loading_animation
@@ -27,6 +31,9 @@ from scripts.euclidean_rhythm import EuclideanRhythm
 from scripts.coin_toss import CoinToss
 
 
+DEBUG = const(0)
+
+
 # Initialize a Clock for the sequencer.
 #clock = Clock(tempo_knob = knob_1,
 #              clock_bus = digital_in,
@@ -67,6 +74,8 @@ async def main(script: any):
     digital_off()
     add_reset_handler()
     sleep_ms(500)
+    # Collect garbage from previous runs before the script starts.
+    gc.collect()
     # Execute script in main async loop.
     loop = asyncio.get_event_loop()
     loop.create_task(script.start())
@@ -82,12 +91,13 @@ def bootloader():
 
     # Bootloader script selection.
     while True:
-        choice = knob_1.choice(SCRIPT_COUNT)
-        b = display_choice(choice)
+        choice = knob_1.choice_int(SCRIPT_COUNT)
+        display_choice(choice)
 
         # Debug logging.
-        print("choice: {} display: {} button: {} script: {}".format(
-            choice, b, button_1.value(), scripts[choice].__qualname__))
+        if DEBUG:
+            print("choice: {} display: {:04b} button: {} script: {}".format(
+                choice, choice, button_1.value(), scripts[choice].__qualname__))
 
         # If button 1 is pressed, execute the currently selected script.
         if button_1.value() == 0:
@@ -100,6 +110,8 @@ def bootloader():
                 # Reset button handlers
                 button_1.reset_handler()
                 button_2.reset_handler()
+                # Drop trigger workers from the stopped event loop
+                reset_triggers()
                 # Enable clock in case it's disabled
                 clock.toggle_edit(True)
 
@@ -39,13 +39,18 @@ External Clock Source:
 TODO: allow external clock source to receive clock and pass-through.
 
 """
+from array import array
+
 from machine import Pin
-from utime import sleep_ms
+from utime import ticks_add, ticks_diff, ticks_ms
+import uasyncio as asyncio
 
 from lib.europi import Button, Knob
 
 MIN_BPM = 20
 MAX_BPM = 280
+# Minimum interval between tempo knob samples in ms.
+SAMPLE_MS = 20
 
 
 class Clock:
@@ -60,9 +65,19 @@ class Clock:
                  avg_run_len: int = 1) -> None:
         # Default clock source.
         self._internal_clock = internal_clock
+        # Wait for a clock cycle of the current selected clock source, bound
+        # directly to the source's wait method whenever the source changes.
+        self.wait = self.internal_clock_wait if internal_clock else self.external_clock_wait
         # Enable/disable ability to change tempo.
         self.edit_mode = True
 
+        # GPIO Pin for clock bus, either external clock source or pass internal clock.
+        # Each falling edge of an external clock pulse is flagged by an IRQ.
+        self.clock_bus = clock_bus
+        self._clock_flag = asyncio.ThreadSafeFlag()
+        if clock_bus is not None:
+            clock_bus.irq(trigger=Pin.IRQ_FALLING, handler=self._clock_edge)
+
         # Input controls for internal clock.
         self.tempo_knob = tempo_knob
         self.clock_switch = clock_switch
@@ -70,17 +85,26 @@ class Clock:
             clock_switch.handler(self.switch_clock_source)
             self.switch_clock_source()
 
-        # GPIO Pin for clock bus, either external clock source or pass internal clock.
-        self.clock_bus = clock_bus
-        self._prev_clock = 0
-
         # Tempo range vars
         self.min_bpm = min_bpm
         self.max_bpm = max_bpm
 
-        # Running average vars for smoothing analog input for tempo.
+        # Running average vars for smoothing analog input for tempo. Samples
+        # are kept in a fixed ring buffer with a running sum to avoid
+        # allocating on every tempo reading.
         self._run_len = avg_run_len
-        self._run = [120] * self._run_len
+        self._run = array('f', [120.0] * self._run_len)
+        self._run_sum = 120.0 * self._run_len
+        self._run_idx = 0
+
+        # Whole BPM tempo and quarter note duration cached by refresh().
+        self._tempo_int = 120
+        self._cached_wait_ms = None
+        self._last_sample = ticks_ms()
+        self.refresh(force=True)
+
+        # Deadline of the next internal clock tick.
+        self._next_tick = ticks_ms()
 
     def toggle_edit(self, enabled=None):
         """Enable/disable ability to change tempo."""
@@ -91,45 +115,80 @@ class Clock:
 
     def switch_clock_source(self) -> None:
         """Switch between internal and external clock source."""
+        was_internal = self._internal_clock
         self._internal_clock = not bool(self.clock_switch.value())
+        self.wait = self.internal_clock_wait if self._internal_clock else self.external_clock_wait
+        if self._internal_clock == was_internal:
+            return
+        # Release a pending external clock wait.
+        if self._internal_clock:
+            self._clock_flag.set()
+        # Clear the flag so an edge left over from the internal clock period
+        # is not taken as the first external tick.
+        else:
+            self._clock_flag.clear()
+
+    def _clock_edge(self, pin: Pin) -> None:
+        self._clock_flag.set()
     
     @property
     def tempo(self) -> float:
-        """Take a reading from the tempo knob to determine internal tempo."""
-        # Return current tempo if edit mode disabled:
-        if not self.edit_mode:
-            return round(sum(self._run) / self._run_len, 1)
-        # Set the clock speed via Knob 1.
-        # tempo range default is between 20 and 280 BPM.
-        # Knob 12 o'clock position is 150 BPM.
-        _tempo =  (self.tempo_knob.percent() * (self.max_bpm - self.min_bpm)) + self.min_bpm
-        # Get the running average tempo.
-        self._run = self._run[1:]
-        self._run.append(_tempo)
-        return round(sum(self._run) / self._run_len, 1)
+        """The running average tempo as of the last refresh, for display."""
+        return round(self._run_sum / self._run_len, 1)
+
+    def refresh(self, force: bool = False) -> int:
+        """Take a reading from the tempo knob and cache the quarter note wait.
+
+        Call once per clock tick, returns the new quarter note duration in ms.
+        The knob is sampled at most once every SAMPLE_MS unless forced, so
+        very fast tempos reuse the cached wait between samples.
+        """
+        now = ticks_ms()
+        if not force and ticks_diff(now, self._last_sample) < SAMPLE_MS:
+            return self._cached_wait_ms
+        self._last_sample = now
+
+        # Only sample the tempo knob if edit mode enabled.
+        if self.edit_mode:
+            # Set the clock speed via Knob 1.
+            # tempo range default is between 20 and 280 BPM.
+            # Knob 12 o'clock position is 150 BPM.
+            _tempo =  (self.tempo_knob.percent() * (self.max_bpm - self.min_bpm)) + self.min_bpm
+            # Replace the oldest sample in the running average.
+            old = self._run[self._run_idx]
+            self._run[self._run_idx] = _tempo
+            self._run_sum += _tempo - old
+            self._run_idx = (self._run_idx + 1) % self._run_len
+        # Round to a whole BPM so the wait is a single integer division.
+        self._tempo_int = int(self._run_sum / self._run_len + 0.5)
+        self._cached_wait_ms = 15000 // self._tempo_int
+        return self._cached_wait_ms
 
     def wait_ms(self) -> int:
-        """The duration of a quarter note in ms for the current tempo."""
-        return int(((60 / self.tempo) / 4) * 1000)
+        """The duration of a quarter note in ms as of the last refresh."""
+        return self._cached_wait_ms
 
-    def internal_clock_wait(self) -> None:
+    async def internal_clock_wait(self) -> None:
         """Wait for a quarter note of the internal tempo."""
-        sleep_ms(self.wait_ms())
+        # Advance the deadline by one quarter note so time spent between
+        # waits does not accumulate as drift.
+        wait_ms = self.refresh()
+        now = ticks_ms()
+        self._next_tick = ticks_add(self._next_tick, wait_ms)
+        delay = ticks_diff(self._next_tick, now)
+        if delay < -wait_ms:
+            # More than a full period behind, e.g. after a pause, so restart
+            # from now.
+            self._next_tick = ticks_add(now, wait_ms)
+            delay = wait_ms
+        elif delay < 0:
+            # Slightly late, tick now and keep the schedule to catch up.
+            delay = 0
+        await asyncio.sleep_ms(delay)
         # Send clock pulse to clock bus.
         #if self.clock_bus:
         #    self.clock_bus.value(1); sleep_ms(10); self.clock_bus.value(0)
 
-    def external_clock_wait(self) -> None:
-        """Wait for clock pulse to go high to advance."""
-        while not self._internal_clock:
-            if self.clock_bus.value() != self._prev_clock:
-                self._prev_clock = 1 if self._prev_clock == 0 else 0
-                if self._prev_clock == 0:
-                    return
-
-    def wait(self) -> None:
-        """Wait for a clock cycle of the current selected clock source."""
-        if self._internal_clock:
-            self.internal_clock_wait()
-        else:
-            self.external_clock_wait()
+    async def external_clock_wait(self) -> None:
+        """Wait for the end of the next external clock pulse to advance."""
+        await self._clock_flag.wait()
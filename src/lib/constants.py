@@ -2,9 +2,10 @@
 Common constant value definitions.
 
 """
+from micropython import const
 
 # Maximum unsigned 16 bit integer value.
-UINT_16 = 65535
+UINT_16 = const(65535)
 
 # One chromatic step given 16 bit over 3.3v output. 
 CHROMATIC_STEP = UINT_16 / (11.75 * 3.3)
@@ -32,6 +32,7 @@ class DigitalSwitch:
         self.debounce_delay = debounce_delay  # delay in ms
         self.last_pressed = 0
         self.debounce_done = True
+        self._user_handler = None
 
     def value(self):
         """Read the digital pin, plug present (1) or removed (0)."""
@@ -41,19 +42,17 @@ class DigitalSwitch:
         if (ticks_ms() - self.last_pressed) > self.debounce_delay:
             self.debounce_done = True
 
+    def _irq(self, pin):
+        self._debounce_check()
+        if self.debounce_done:
+            self.last_pressed = ticks_ms()
+            self.debounce_done = False
+            self._user_handler()
+
     # Handler takes a callback func to call when this button is pressed.
     def handler(self, func):
-        def bounce(func):
-            def wrap_bounce(*args, **kwargs):
-                self._debounce_check()
-                if self.debounce_done:
-                    self.last_pressed = ticks_ms()
-                    self.debounce_done = False
-                    func()
-
-            return wrap_bounce
-
-        self.pin.irq(trigger=Pin.IRQ_RISING, handler=bounce(func))
+        self._user_handler = func
+        self.pin.irq(trigger=Pin.IRQ_RISING, handler=self._irq)
 
 
 # Analog & Digital input jacks
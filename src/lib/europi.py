@@ -13,8 +13,8 @@ https://allensynthesis.co.uk/europi_assembly.html
 """
 from random import random
 
-from machine import Pin, PWM, ADC
-from utime import sleep_ms, ticks_ms
+from machine import Pin, PWM, ADC, Timer, mem32
+from utime import sleep_ms
 
 from lib.constants import UINT_16
 
@@ -23,6 +23,17 @@ from lib.constants import UINT_16
 # This reduces the noise from analog reads.
 Pin(23, Pin.OUT).value(1)
 
+# RP2040 SIO registers for setting or clearing many GPIO outputs at once.
+SIO_BASE = 0xd0000000
+GPIO_OUT_SET = SIO_BASE + 0x014
+GPIO_OUT_CLR = SIO_BASE + 0x018
+
+
+def choice_of(raw: int, options: int) -> int:
+    """Integer choice from a range of options for a raw 16 bit knob reading."""
+    # Subtract the 0.001 deadband (66 / 65536) and scale to the options.
+    return (max(raw - 66, 0) * options) >> 16
+
 
 class Knob:
     def __init__(self, pin: int):
@@ -35,6 +46,10 @@ class Knob:
     def choice(self, options: int):
         """Return a value from a range chosen by the knob position."""
         return int((self.percent() - 0.001) * options)
+
+    def choice_int(self, options: int) -> int:
+        """Integer only version of choice() for use in hot loops."""
+        return choice_of(self.pin.read_u16(), options)
     
     def value(self) -> int:
         """Provide the current value of the knob position between 0 and 65535 (max 16 bit int)."""
@@ -42,37 +57,52 @@ class Knob:
 
 
 class Button:
-    def __init__(self, pin: int, debounce_delay: int = 500):
+    SAMPLE_MS = 4  # Debounce sampling period in ms.
+
+    def __init__(self, pin: int, debounce_samples: int = 8):
         self.pin = Pin(pin, Pin.IN, Pin.PULL_UP)
-        self.debounce_delay = debounce_delay  # delay in ms
-        self.last_pressed = 0
-        self.debounce_done = True
+        # Debounce state: the most recent pin samples are shifted into _hist
+        # and the button only changes state once all of them agree.
+        self._hist = 0
+        self._stable_mask = (1 << debounce_samples) - 1
+        self._released = True
+        self._func = None
+        self._timer = None
     
     def value(self) -> int:
         """Current button state. Default state is HIGH (1) and LOW (0) is pressed.""" 
         return self.pin.value()
 
-    def _debounce_check(self) -> None:
-        if (ticks_ms() - self.last_pressed) > self.debounce_delay:
-            self.debounce_done = True
+    def _sample(self, timer: Timer) -> None:
+        self._hist = ((self._hist << 1) | self.pin.value()) & self._stable_mask
+        if self._hist == self._stable_mask:
+            # Stable HIGH, fire the handler once on release.
+            if not self._released:
+                self._released = True
+                self._func()
+        elif self._hist == 0:
+            self._released = False
 
     def handler(self, func: function) -> None:
         """Handler takes a callback func to call when this button is pressed."""
-        def bounce(func):
-            def wrap_bounce(*args, **kwargs):
-                self._debounce_check()
-                if self.debounce_done:
-                    self.last_pressed = ticks_ms()
-                    self.debounce_done = False
-                    func()
-
-            return wrap_bounce
-
-        self.pin.irq(trigger=Pin.IRQ_RISING, handler=bounce(func))
+        self._func = func
+        if self._timer is None:
+            # Start debouncing from the current pin state so a release left
+            # over from a previous handler does not fire this one.
+            if self.pin.value():
+                self._hist = self._stable_mask
+                self._released = True
+            else:
+                self._hist = 0
+                self._released = False
+            self._timer = Timer(period=self.SAMPLE_MS, mode=Timer.PERIODIC,
+                                callback=self._sample)
     
     def reset_handler(self) -> None:
         """Disable the handler function."""
-        self.pin.irq(trigger=Pin.IRQ_RISING)
+        if self._timer is not None:
+            self._timer.deinit()
+            self._timer = None
 
 
 class AnalogOut:
@@ -87,6 +117,8 @@ class AnalogOut:
 class DigitalOut:
     def __init__(self, pin: int):
         self.pin = Pin(pin, Pin.OUT)
+        self.mask = 1 << pin  # GPIO bit used by set_digital
+        self._trigger = None  # Pulse worker assigned by lib.helpers
 
     def value(self, value: int) -> None:
         """Set the digital pin to the given value, HIGH (1) or LOW (0)."""
@@ -117,6 +149,18 @@ digital_2 = DigitalOut(22)
 digital_3 = DigitalOut(19)
 digital_4 = DigitalOut(20)
 
-# Each analog and digital output object in a list.
-analog_outputs = [analog_1, analog_2, analog_3, analog_4]
-digital_outputs = [digital_1, digital_2, digital_3, digital_4]
+# Each analog and digital output object in a tuple.
+analog_outputs = (analog_1, analog_2, analog_3, analog_4)
+digital_outputs = (digital_1, digital_2, digital_3, digital_4)
+
+
+def set_digital(mask_set: int, mask_clr: int = 0) -> None:
+    """Set and clear the digital outputs in the given GPIO bitmasks.
+
+    Each mask is applied with a single register write, so all of its outputs
+    change together. Empty masks are skipped.
+    """
+    if mask_set:
+        mem32[GPIO_OUT_SET] = mask_set
+    if mask_clr:
+        mem32[GPIO_OUT_CLR] = mask_clr
@@ -2,13 +2,52 @@
 Helper functions.
 
 """
-from random import random, randint
-from time import sleep
+from random import getrandbits, random
 
 import uasyncio as asyncio
 
-from lib.constants import UINT_16
-from lib.europi import DigitalOut, digital_outputs
+from lib.europi import DigitalOut, digital_outputs, set_digital
+
+
+class _TriggerTask:
+    """Long running pulse worker for a GPIO bitmask, reused for every trigger."""
+
+    def __init__(self, mask: int):
+        self.mask = mask
+        self.delay = 10
+        self.flag = asyncio.Event()
+        self.task = None
+
+    def pulse(self, delay: int) -> None:
+        self.delay = delay
+        # Start the worker on first use in the current event loop.
+        if self.task is None:
+            loop = asyncio.get_event_loop()
+            self.task = loop.create_task(self._run())
+        self.flag.set()
+
+    def reset(self) -> None:
+        self.flag = asyncio.Event()
+        self.task = None
+
+    async def _run(self) -> None:
+        flag = self.flag
+        while True:
+            await flag.wait()
+            flag.clear()
+            mask = self.mask
+            set_digital(mask)
+            await asyncio.sleep_ms(self.delay)
+            set_digital(0, mask)
+
+
+# Preallocated trigger workers, one stored on each digital output plus one for
+# pulsing a GPIO bitmask of several outputs together.
+for _d in digital_outputs:
+    _d._trigger = _TriggerTask(_d.mask)
+del _d
+_MASK_TRIGGER = _TriggerTask(0)
+_TRIGGER_POOL = [d._trigger for d in digital_outputs] + [_MASK_TRIGGER]
 
 
 def random_chance(percentage: float) -> bool:
@@ -16,21 +55,26 @@ def random_chance(percentage: float) -> bool:
 
 
 def randint16() -> int:
-    return randint(0, UINT_16)
+    """Random unsigned 16 bit integer."""
+    return getrandbits(16)
 
 def percent_to_volts(percentage: float) -> float:
     """Converts a float between 0 and 1 into an equivalent 3.3v value."""
-    if percentage > 1:
-        raise ValueError("volts expects a percentage between 0 and 1.")
     return percentage * 3.3
 
 def trigger(digital: DigitalOut, delay: int = 10) -> None:
     """Trigger a digital jack in a thread to avoid affecting tempo."""
-    loop = asyncio.get_event_loop()
-    loop.create_task(_trigger(digital, delay))
+    digital._trigger.pulse(delay)
+
+
+def trigger_mask(mask: int, delay: int = 10) -> None:
+    """Trigger every digital jack in the GPIO bitmask together."""
+    t = _MASK_TRIGGER
+    t.mask = mask
+    t.pulse(delay)
 
 
-async def _trigger(digital: DigitalOut, delay: int) -> None:
-    digital.value(1)
-    await asyncio.sleep_ms(delay)
-    digital.value(0)
+def reset_triggers() -> None:
+    """Discard the trigger workers after their event loop has been stopped."""
+    for t in _TRIGGER_POOL:
+        t.reset()
@@ -10,6 +10,8 @@ that musical scale. The class also provides convenience methods for playing
 the scale in several ways.
 
 """
+from array import array
+
 from lib.constants import CHROMATIC_STEP
 
 
@@ -18,7 +20,7 @@ class Scale:
 
     OCTAVE_RANGE = 3
 
-    notes: list(int)
+    notes: array
     include_octave: bool
 
     def __init__(self, notes: tuple(int), include_octave: bool = False) -> None:
@@ -39,16 +41,11 @@ class Scale:
 def create_scale(notes: tuple(int), max_steps: int = 36):
     if max_steps > 37:
         raise ValueError("More than 37 steps will exceed pico's 3.3V output")
-    scale = []
-    note = 0
-    step = 1
-    while note < (CHROMATIC_STEP * max_steps):
-        if step in notes:
-            scale.append(int(note))
-        note += CHROMATIC_STEP
-        step += 1
-        if step == 13:
-            step = 1
+    # Quantize each chromatic step once into a compact uint16 array.
+    scale = array('H')
+    for i in range(max_steps):
+        if (i % 12) + 1 in notes:
+            scale.append(int(round(CHROMATIC_STEP * i)))
     return scale
 
 
@@ -13,35 +13,35 @@ from utime import sleep_ms
 from lib.europi import DigitalOut, digital_outputs
 
 
+# Back and forth snake pattern of digital LEDs used by loading_animation.
+_LOADING_SEQ = digital_outputs + digital_outputs[::-1] * 3
+
+
 def digital_off() -> None:
     """Turn all digital outputs off."""
     for output in digital_outputs:
         output.value(0)
 
 
-def display_choice(choice: int) -> str:
+def display_choice(choice: int) -> None:
     """Display given choice as binary using the digital LEDs.
     
     Convert the input choice (0..15) to a 4 bit binary and display that on the
-    digital out LEDs. Returns the 4 bit binary string.
+    digital out LEDs, most significant bit first.
     """
     if choice > 15:
         raise ValueError("choice must be between 0 and 15")
-    # Convert the choice into 4 bit binary used to show choice in the 4
-    # digital out LEDs.
-    b = '{:04b}'.format(choice)
-    # Convert each positional binary value into corresponding digital output
-    # LED value.
-    for i, output in enumerate(digital_outputs):
-        output.value(int(b[i]))
-    return b
+    # Shift each bit of the choice into its corresponding digital output LED.
+    for i in range(4):
+        digital_outputs[i].value((choice >> (3 - i)) & 1)
 
 
 def loading_animation() -> None:
     """Cycle the lights of the digital LEDs in a back and forth snake pattern 
     for 3 iterations."""
     sleep_ms(500)
-    [_blink(d) for d in digital_outputs + digital_outputs[::-1] * 3]
+    for d in _LOADING_SEQ:
+        _blink(d)
     sleep_ms(500)
 
 
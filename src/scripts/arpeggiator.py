@@ -22,8 +22,11 @@ digital_3: trigger at sequence step divided by 3
 digital_4: trigger at sequence step divided by 4
 """
 
-from random import choice
+import gc
+from array import array
+from random import randint
 
+from micropython import const
 import uasyncio as asyncio
 from utime import sleep_ms
 
@@ -33,11 +36,11 @@ from lib.europi import knob_2
 from lib.europi import button_1
 from lib.europi import analog_outputs
 from lib.europi import digital_outputs
-from lib.helpers import trigger
+from lib.helpers import trigger_mask
 from lib.scales import scales
 
 
-DEBUG = False
+DEBUG = const(0)
 
 
 class Arpeggiator:
@@ -45,21 +48,27 @@ class Arpeggiator:
     OCTAVE_RANGE = 3  # EuroPi outputs max 3.3v so we only have a 3 octave range
 
     def __init__(self, clock: Clock):
-        self.scale = scales[0]
+        self._scale_idx = 0
+        self.scale = scales[self._scale_idx]
         self.clock = clock
         self.prev_octave_range = 1
 
         self.step = 0
         self.bi_forward = True
         self.octave_range = 1
+        self._slen = self.scale.step_count(self.octave_range)
+
+        # Current note for each analog output, written in place every step.
+        self._out = array('H', [0, 0, 0, 0])
 
     def get_octave_range(self) -> int:
         """Get the current selected octave range."""
-        return knob_2.choice(self.OCTAVE_RANGE) + 1
+        return knob_2.choice_int(self.OCTAVE_RANGE) + 1
 
     def restart(self, octave_range: int) -> None:
         """Restart the scale sequence."""
         self.octave_range = octave_range
+        self._slen = self.scale.step_count(octave_range)
         self.step = 0
         self.bi_forward = True
 
@@ -74,55 +83,74 @@ class Arpeggiator:
     
     def scale_len(self) -> int:
         """Returns the step count of the current scale."""
-        return self.scale.step_count(self.octave_range)
+        return self._slen
 
-    def play(self) -> tuple(int):
+    def play(self) -> None:
         """Calculate the current note for each arpeggio pattern."""
-        fwd = self.scale.notes[self.step]
-        bwd = self.scale.notes[0 : self.scale_len()][0 - self.step - 1]
-        bi = fwd if self.bi_forward else bwd
-        rnd = choice(self.scale.notes[0 : self.scale_len()])
-        return fwd, bwd, bi, rnd
+        n = self.scale.notes
+        s = self._slen
+        step = self.step
+        fwd = n[step]
+        bwd = n[s - 1 - step]
+        self._out[0] = fwd
+        self._out[1] = bwd
+        self._out[2] = fwd if self.bi_forward else bwd
+        self._out[3] = n[randint(0, s - 1)]
+
+    def next_scale(self) -> None:
+        """Cycle to the next scale sequence."""
+        self._scale_idx = (self._scale_idx + 1) % len(scales)
+        self.scale = scales[self._scale_idx]
+        self.restart(self.get_octave_range())
 
     async def start(self):
         """Start the script execution."""
         # Handler function for button 1 to cycle to the next scale sequence.
-        @button_1.handler
-        def next_scale():
-            self.scale = scales[(scales.index(self.scale) + 1) % len(scales)]
-            self.restart(self.get_octave_range())
+        button_1.handler(self.next_scale)
+
+        # Bind module globals and methods used on every step to locals.
+        a1, a2, a3, a4 = (a.value for a in analog_outputs)
+        out = self._out
+        play = self.play
+        next_step = self.next_step
+        get_octave_range = self.get_octave_range
+        trg = trigger_mask
+        m1, m2, m3, m4 = (d.mask for d in digital_outputs)
 
         # Increment sequence step, or cycle back to the beginning.
-        while self.next_step():
+        while next_step():
             # Set the octave range
-            octave_range = self.get_octave_range()
+            octave_range = get_octave_range()
             if octave_range != self.prev_octave_range:
                 self.prev_octave_range = octave_range
                 self.restart(octave_range)
 
             # Choose the frequency for each arp direction.
-            fwd, bwd, bi, rnd = self.play()
-            analog_outputs[0].value(fwd)
-            analog_outputs[1].value(bwd)
-            analog_outputs[2].value(bi)
-            analog_outputs[3].value(rnd)
-
-            # Activate triggers for this scale sequence step.
-            trigger(digital_outputs[0])
-            if self.step == 0:
-                trigger(digital_outputs[1])
-            if self.step % 3 == 0:
-                trigger(digital_outputs[2])
-            if self.step % 4 == 0:
-                trigger(digital_outputs[3])
+            play()
+            a1(out[0])
+            a2(out[1])
+            a3(out[2])
+            a4(out[3])
+
+            # Activate triggers for this scale sequence step, writing all of
+            # the digital outputs at once.
+            step = self.step
+            mask = m1
+            if step == 0:
+                mask |= m2
+            if step % 3 == 0:
+                mask |= m3
+            if step % 4 == 0:
+                mask |= m4
+            trg(mask)
 
             if DEBUG:
                 msg = "{:>2}) A[1:{:>6} 2:{:>6} 3:{:>6} 4:{:>6}] scale:{:>2} octaves:{:>2} tempo: {}".format(
-                    self.step, fwd, bwd, bi, rnd, scales.index(self.scale), octave_range, self.clock.tempo
+                    step, *out, self._scale_idx, octave_range, self.clock.tempo
                 )
                 print(msg)
 
-            await asyncio.sleep_ms(self.clock.wait_ms())
+            await self.clock.wait()
 
 
 if __name__ == '__main__':
@@ -131,6 +159,8 @@ if __name__ == '__main__':
 
     # Main script function
     async def main():
+        # Collect garbage left from start up before entering the main loop.
+        gc.collect()
         loop = asyncio.get_event_loop()
         loop.create_task(arp.start())
         loop.run_forever()
@@ -18,6 +18,9 @@ digital_3: third division, default /4
 digital_4: fourth division, default /8
 
 """
+import gc
+import micropython
+from micropython import const
 import uasyncio as asyncio
 
 from lib.europi import knob_1
@@ -25,15 +28,28 @@ from lib.europi import knob_2
 from lib.europi import button_2
 from lib.europi import digital_outputs
 from lib.clock import Clock
-from lib.helpers import trigger
+from lib.helpers import trigger_mask
 
 
-DEBUG = False
+DEBUG = const(0)
 
 # Useful divisions to choose from.
 DIVISION_CHOICES = [1, 2, 3, 4, 5, 6, 7, 8, 12, 16]
 MAX_DIVISION = max(DIVISION_CHOICES)
 
+# GPIO bitmask for each combination of digital outputs, indexed by output bits.
+_OUTPUT_MASKS = [
+    sum(d.mask for i, d in enumerate(digital_outputs) if bits >> i & 1)
+    for bits in range(1 << len(digital_outputs))
+]
+
+
+def _lcm(a: int, b: int) -> int:
+    x, y = a, b
+    while y:
+        x, y = y, x % y
+    return a * b // x
+
 
 class ClockDivider:
 
@@ -43,22 +59,36 @@ class ClockDivider:
         # Divisions corresponding to each digital output.
         self.divisions = [1, 2, 4, 8]
 
-        # Counters for each clock division (use a copy of the values, not the reference)
-        self.counters = self.divisions[:]
+        # Position in the division cycle and the output bits to trigger on
+        # each of its ticks, rebuilt whenever a division changes.
+        self.counter = 0
+        self.build_triggers()
 
         # Selects the Digital Jack to adjust clock division using 0-based index with an
         # extra index to disable config controls.
         self.selected_output = -1
         self._previous_choice = knob_2.choice(len(DIVISION_CHOICES))
 
+    def build_triggers(self):
+        """Precompute which digital jacks trigger on each tick of the division cycle."""
+        cycle = 1
+        for d in self.divisions:
+            cycle = _lcm(cycle, d)
+        table = bytearray(cycle)
+        # Visit only the ticks each jack fires on, i.e. every d-th tick.
+        for bit, d in zip((1, 2, 4, 8), self.divisions):
+            for c in range(d - 1, cycle, d):
+                table[c] |= bit
+        self._trigger_at = table
+        self.counter %= cycle
+
+    @micropython.native
     def trigger(self):
         """Emit a trigger for each digital jack within this clock cycle."""
-        for i, pin in enumerate(digital_outputs):
-            self.counters[i] -= 1
-            if self.counters[i] == 0:
-                trigger(pin)
-                # Reset counter for this division
-                self.counters[i] = self.divisions[i]
+        bits = self._trigger_at[self.counter]
+        if bits:
+            trigger_mask(_OUTPUT_MASKS[bits])
+        self.counter = (self.counter + 1) % len(self._trigger_at)
 
     def adjust_division(self):
         """When a digital jack is selected, read division choice and update it's division."""
@@ -66,31 +96,37 @@ class ClockDivider:
             choice = knob_2.choice(len(DIVISION_CHOICES))
             if choice != self._previous_choice:
                 self.divisions[self.selected_output] = DIVISION_CHOICES[choice]
-                self.counters[self.selected_output] = DIVISION_CHOICES[choice]
+                self.build_triggers()
                 self._previous_choice = choice
 
+    def config_divisions(self):
+        """Cycle the output selected for clock division changes."""
+        self.selected_output = (self.selected_output + 1) % len(self.divisions)
+
     async def start(self):
         # Register button handlers.
-        @button_2.handler
-        def config_divisions():
-            self.selected_output = (self.selected_output + 1) % len(self.divisions)
+        button_2.handler(self.config_divisions)
+
+        # Bind hot callables once.
+        trigger = self.trigger
+        adjust_division = self.adjust_division
 
         # Start the main loop.
         while True:
             # Trigger the digital pin if it's divisible by the counter.
-            self.trigger()
+            trigger()
 
             # Set the currently selected digital out's clock division to the value
             # selected by knob 2.
-            self.adjust_division()
+            adjust_division()
 
-            self.debug()
-            await asyncio.sleep_ms(self.clock.wait_ms())
+            if DEBUG:
+                self.debug()
+            await self.clock.wait()
 
     def debug(self):
-        if DEBUG:
-            msg = 'DJ: {}  || Counters: {}  || config: {} || tempo: {} wait: {}'
-            print(msg.format(self.divisions, self.counters, self.selected_output, self.clock.tempo, self.clock.wait_ms()))
+        msg = 'DJ: {}  || Counter: {}  || config: {} || tempo: {} wait: {}'
+        print(msg.format(self.divisions, self.counter, self.selected_output, self.clock.tempo, self.clock.wait_ms()))
 
 
 # Run the script if called directly.
@@ -100,6 +136,8 @@ if __name__ == '__main__':
 
     # Main script function
     async def main():
+        # Collect garbage left from start up before entering the main loop.
+        gc.collect()
         loop = asyncio.get_event_loop()
         loop.create_task(clock_divider.start())
         loop.run_forever()
@@ -21,13 +21,15 @@ digital_3: Coin 2 gate on when voltage above threshold
 digital_4: Coin 2 gate on when voltage below threshold
 
 """
-from random import random
+import gc
+from random import getrandbits
 
+from micropython import const
 import uasyncio as asyncio
-from utime import ticks_ms
 
 from lib.clock import Clock
 from lib.clock import MAX_BPM
+from lib.constants import UINT_16
 from lib.europi import DigitalOut
 from lib.europi import knob_1
 from lib.europi import knob_2
@@ -42,7 +44,7 @@ from lib.helpers import percent_to_volts as v
 from lib.ui import digital_off
 
 
-DEBUG = False
+DEBUG = const(0)
 NORMAL = MAX_BPM
 TURBO = 10000
 TOGGLE_SPEED = NORMAL ^ TURBO
@@ -54,13 +56,8 @@ class CoinToss:
         self.clock = clock
         self.gate_mode = True
     
-    def get_next_deadline(self):
-        """Get the deadline for next clock tick whole note."""
-        return ticks_ms() + (self.clock.wait_ms() * 4)
-    
-    def toss(self, a: DigitalOut, b: DigitalOut) -> float:
-        coin = random()
-        threshold = knob_2.percent()
+    def toss(self, a: DigitalOut, b: DigitalOut, threshold: int) -> int:
+        coin = getrandbits(16)
         if self.gate_mode:
             a.value(coin > threshold)
             b.value(coin < threshold)
@@ -68,41 +65,52 @@ class CoinToss:
             trigger(a if coin > threshold else b)
         return coin
 
-    def debug(self, c1, c2):
-        if DEBUG:
-            print("COIN1: {:>.2f}  COIN2: {:>.2f}  THRESH: {:>.2f}".format(
-                v(c1), v(c2), v(knob_2.percent())))
+    def debug(self, c1, c2, threshold):
+        print("COIN1: {:>.2f}  COIN2: {:>.2f}  THRESH: {:>.2f}".format(
+            v(c1 / UINT_16), v(c2 / UINT_16), v(threshold / UINT_16)))
     
+    def toggle_speed(self):
+        """Toggle the clock between normal and turbo speed."""
+        self.clock.max_bpm ^= TOGGLE_SPEED
+
+    def toggle_gate(self):
+        """Toggle between gate and trigger output mode."""
+        self.gate_mode = not self.gate_mode
+        digital_off()
+
     async def start(self):
         # Register button handlers
-        @button_1.handler
-        def toggle_speed():
-            self.clock.max_bpm ^= TOGGLE_SPEED
-        
-        @button_2.handler
-        def toggle_gate():
-            self.gate_mode = not self.gate_mode
-            digital_off()
-        
+        button_1.handler(self.toggle_speed)
+        button_2.handler(self.toggle_gate)
+
+        # Bind methods used on every tick to locals.
+        toss = self.toss
+        knob_value = knob_2.value
+
         # Start the main loop.
-        deadline = self.get_next_deadline()
-        coin1 = self.toss(digital_1, digital_2)
+        tick = 0
         while True:
+            # Read the probability threshold once per tick.
+            threshold = knob_value()
+
             # D1/2 pair coin toss on the whole note. (1x speed)
-            if ticks_ms() > deadline:
-                deadline = self.get_next_deadline()
-                coin1 = self.toss(digital_1, digital_2)
+            if tick == 0:
+                coin1 = toss(digital_1, digital_2, threshold)
+            tick = (tick + 1) % 4
 
             # D3/4 pair coin toss on the quarter note. (4x speed)
-            coin2 = self.toss(digital_3, digital_4)
+            coin2 = toss(digital_3, digital_4, threshold)
 
-            self.debug(coin1, coin2)
-            await asyncio.sleep_ms(self.clock.wait_ms())
+            if DEBUG:
+                self.debug(coin1, coin2, threshold)
+            await self.clock.wait()
 
 
 if __name__ == '__main__':
     clock = Clock(knob_1)
     coin_toss = CoinToss(clock)
+    # Collect garbage left from start up before entering the main loop.
+    gc.collect()
     loop = asyncio.new_event_loop()
     loop.create_task(coin_toss.start())
     loop.run_forever()
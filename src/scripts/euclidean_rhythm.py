@@ -22,6 +22,9 @@ digital_3: pattern 3
 digital_4: pattern 4
 
 """
+import gc
+from array import array
+from micropython import const
 import uasyncio as asyncio
 
 from lib.button import Pushbutton
@@ -39,7 +42,31 @@ from lib.europi import digital_4
 from lib.helpers import trigger
 
 
-DEBUG = False
+DEBUG = const(0)
+
+# Largest number of steps in a pattern.
+_MAX_STEPS = const(16)
+
+
+def _euclid(steps: int, pulses: int) -> int:
+    """Bitmask of the Euclidean rhythm, with bit i set when step i is high."""
+    m = 0
+    step = 0
+    for i in range(steps):
+        step += pulses
+        if step >= steps:
+            step -= steps
+            m |= 1 << i
+    return m
+
+
+# Bitmask for every (steps, pulses) pattern, indexed by steps * 17 + pulses.
+_EUCLID_LUT = array('H', bytes(2 * 17 * 17))
+for _s in range(1, _MAX_STEPS + 1):
+    for _p in range(_s + 1):
+        _EUCLID_LUT[_s * 17 + _p] = _euclid(_s, _p)
+del _s, _p
+
 
 class Pattern:
     """A Euclidean rhythm pattern bound to a DigitalOut pin."""
@@ -49,12 +76,12 @@ class Pattern:
         self.steps = steps
         self.pulses = pulses
         self.step = 0
-        self._pattern = [0] * steps
+        self._pattern = 0  # Bitmask with bit i set when step i is high.
         self.build()
 
     def __repr__(self):
         """String representation of the pattern."""
-        return self._pattern
+        return "".join(str(self[i]) for i in range(self.steps))
 
     def __len__(self):
         """Length of the pattern."""
@@ -62,26 +89,36 @@ class Pattern:
 
     def __getitem__(self, index: int):
         """Pattern step getter."""
-        return self._pattern[index]
+        return (self._pattern >> index) & 1
 
     def build(self):
         """Construct the pattern given the given steps and pulses."""
-        step = 0
-        for i in range(self.steps):
-            step += self.pulses
-            if step >= self.steps:
-                step -= self.steps
-                self._pattern[i] = 1
+        m = _EUCLID_LUT[self.steps * 17 + self.pulses]
+        self._pattern = m
+        self.play_step = self._specialize(m, self.steps)
 
-    def play_step(self):
-        """Trigger the current step if high and advance to next step."""
-        if self._pattern[self.step] == 1:
-            trigger(self.out)
-        self.step = (self.step + 1) % self.steps
+    def reconfigure(self, steps: int, pulses: int) -> None:
+        """Rebuild this pattern in place with the given steps and pulses."""
+        self.steps = steps
+        self.pulses = pulses
+        self.step %= steps
+        self.build()
+
+    def _specialize(self, mask: int, steps: int):
+        """Build this pattern's play_step with its mask and length as constants."""
+        # Default args are plain locals inside the function, avoiding attribute
+        # lookups of the pattern state on every step.
+        def play_step(p=self, _m=mask, _n=steps, _out=self.out, _trigger=trigger):
+            """Trigger the current step if high and advance to next step."""
+            s = p.step
+            if _m & (1 << s):
+                _trigger(_out)
+            p.step = (s + 1) % _n
+        return play_step
 
 
 class EuclideanRhythm:
-    MAX_STEPS = 16
+    MAX_STEPS = _MAX_STEPS
 
     def __init__(self, clock: Clock):
         self.clock = clock
@@ -106,21 +143,24 @@ class EuclideanRhythm:
         self._selected_pattern = (self._selected_pattern + 1) % len(self.patterns)
 
     def debug(self):
-        if DEBUG:
-            p = self.patterns[self._selected_pattern]
-            print("{:>2}-{}: steps: {:>2}  pulses: {:>2}  >>  {}".format(
-                p.step, self._selected_pattern, p.steps, p.pulses, p))
+        p = self.patterns[self._selected_pattern]
+        print("{:>2}-{}: steps: {:>2}  pulses: {:>2}  >>  {}".format(
+            p.step, self._selected_pattern, p.steps, p.pulses, p))
+
+    def update(self) -> bool:
+        """Check knobs for a change and update pattern accordingly.
 
-    def update(self):
-        """Check knobs for a change and update pattern accordingly."""
+        Returns True if the selected pattern was rebuilt.
+        """
         if self._pattern_mode:
             _steps = knob_1.choice(self.MAX_STEPS) + 1
             _pulses = knob_2.choice(_steps) + 1
-            p = self.patterns[self._selected_pattern]
             if _steps != self._previous_steps or _pulses != self._previous_pulses:
-                self.patterns[self._selected_pattern] = Pattern(p.out, _steps, _pulses)
+                self.patterns[self._selected_pattern].reconfigure(_steps, _pulses)
                 self._previous_steps = _steps
                 self._previous_pulses = _pulses
+                return True
+        return False
 
     async def start(self):
         # Register button handlers.
@@ -130,17 +170,27 @@ class EuclideanRhythm:
         Pushbutton(button_2.pin)\
             .press_func(self._short2)
 
+        # Bind hot callables once. Each pattern's play_step is rebuilt when
+        # the pattern changes, so rebind them after an update.
+        update = self.update
+        patterns = self.patterns
+        play_1, play_2, play_3, play_4 = (p.play_step for p in patterns)
+
         # Start the main loop.
         while True:
             # Check knob state and update the current pattern.
-            self.update()
+            if update():
+                play_1, play_2, play_3, play_4 = (p.play_step for p in patterns)
 
             # Trigger each pattern with high step.
-            for pattern in self.patterns:
-                pattern.play_step()
+            play_1()
+            play_2()
+            play_3()
+            play_4()
 
-            self.debug()
-            await asyncio.sleep_ms(self.clock.wait_ms())
+            if DEBUG:
+                self.debug()
+            await self.clock.wait()
 
 
 if __name__ == '__main__':
@@ -148,6 +198,8 @@ if __name__ == '__main__':
     euclid = EuclideanRhythm(clock)
 
     async def main():
+        # Collect garbage left from start up before entering the main loop.
+        gc.collect()
         loop = asyncio.get_event_loop()
         loop.create_task(euclid.start())
         loop.run_forever()
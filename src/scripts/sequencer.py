@@ -35,12 +35,17 @@ digital_1: step trigger
 digital_3: reset trigger
 
 """
+import gc
+from array import array
+
+from micropython import const
 import uasyncio as asyncio
 
 # User libraries
 from lib.button import Pushbutton
 from lib.clock import Clock
 from lib.europi import Knob, knob_1
+from lib.europi import choice_of
 from lib.europi import knob_2
 from lib.europi import button_1
 from lib.europi import button_2
@@ -50,7 +55,15 @@ from lib.helpers import trigger
 from lib.scales import chromatic_scale
 
 
-DEBUG = False
+DEBUG = const(0)
+
+# Minimum change in raw knob reading before the pitch is recalculated, to
+# ignore ADC jitter while the knobs are at rest.
+KNOB_DEADBAND = 128
+
+# Pitch cv for each octave (0..2) and chromatic note (0..12) knob position,
+# indexed by octave * 13 + note.
+_PITCH_LUT = array('H', [chromatic_scale[p + o * 12] for o in range(3) for p in range(13)])
 
 
 class Sequencer:
@@ -60,17 +73,17 @@ class Sequencer:
     counter = 0
     selected_output = 0
     _previous_pitch = 0
+    _last_k1 = -KNOB_DEADBAND - 1
+    _last_k2 = -KNOB_DEADBAND - 1
 
     def __init__(self, clock: Clock, seq_len: int = 8):
         # Initialize instance variables
         self.clock = clock
         self.seq_len = seq_len
-        self.pitch = [
-            [0] * self.seq_len,
-            [0] * self.seq_len,
-            [0] * self.seq_len,
-            [0] * self.seq_len,
-        ]
+        # Pitch for each output's steps, stored row by row in a flat array.
+        # Zero filled from a bytes buffer to avoid building a temporary list.
+        self._stride = seq_len
+        self.pitch = array('H', bytes(2 * 4 * seq_len))
 
     def _short1(self):
         if self.edit:
@@ -94,6 +107,7 @@ class Sequencer:
     def toggle_run(self):
         """Toggle between sequence play/pause state."""
         self.run = not self.run
+        self._resume.set()
 
     def toggle_output(self):
         """Toggle between editing analogue outs."""
@@ -111,36 +125,47 @@ class Sequencer:
             self.edit = True
             self.run = False
             self.counter = 0
+        self._resume.set()
     
     def reset_sequence(self):
         """Restart the sequence back to the start and trigger reset."""
         self.counter = 0
         trigger(digital_outputs[2])
 
-    def get_pitch(self) -> int:
-        """Get the pitch cv value for the given knob position."""
+    def get_pitch(self, k1: int, k2: int) -> int:
+        """Get the pitch cv value for the given raw knob readings."""
         # TODO: allow user selected scales.
-        pitch = knob_1.choice(13)
-        octave = knob_2.choice(3) * 12
-        return chromatic_scale[pitch + octave]
+        return _PITCH_LUT[choice_of(k2, 3) * 13 + choice_of(k1, 13)]
 
     def adjust_step(self):
         """Set the pitch for the current output."""
-        pitch = self.get_pitch()
+        # Skip the update unless a knob has moved beyond the deadband.
+        k1 = knob_1.value()
+        k2 = knob_2.value()
+        if abs(k1 - self._last_k1) <= KNOB_DEADBAND and abs(k2 - self._last_k2) <= KNOB_DEADBAND:
+            return
+        self._last_k1 = k1
+        self._last_k2 = k2
+
+        pitch = self.get_pitch(k1, k2)
         if pitch != self._previous_pitch:
-            self.pitch[self.selected_output][self.counter] = pitch
+            self.pitch[self.selected_output * self._stride + self.counter] = pitch
             self._previous_pitch = pitch
             self.play_step()
 
     def play_step(self):
         # Play pitch cv for each output.
-        analog_outputs[0].value(self.pitch[0][self.counter])
-        analog_outputs[1].value(self.pitch[1][self.counter])
-        analog_outputs[2].value(self.pitch[2][self.counter])
-        analog_outputs[3].value(self.pitch[3][self.counter])
+        c = self.counter
+        p = self.pitch
+        s = self._stride
+        analog_outputs[0].value(p[c])
+        analog_outputs[1].value(p[s + c])
+        analog_outputs[2].value(p[2 * s + c])
+        analog_outputs[3].value(p[3 * s + c])
         # Trigger digital 1 on each step
         trigger(digital_outputs[0])
-        self.debug()
+        if DEBUG:
+            self.debug()
 
     def next_step(self):
         self.counter = (self.counter + 1) % self.seq_len
@@ -152,14 +177,16 @@ class Sequencer:
                 trigger(digital_outputs[1], 500)
             else:
                 trigger(digital_outputs[1])
-        self.debug()
+        if DEBUG:
+            self.debug()
 
     def debug(self):
-        if DEBUG:
-            print("S:{} R{} \tA1: {} \tA2: {} \tA3: {} \tA4: {}".format(
-                self.counter, self.selected_output,
-                self.pitch[0][self.counter], self.pitch[1][self.counter],
-                self.pitch[2][self.counter], self.pitch[3][self.counter]))
+        c = self.counter
+        s = self._stride
+        print("S:{} R{} \tA1: {} \tA2: {} \tA3: {} \tA4: {}".format(
+            c, self.selected_output,
+            self.pitch[c], self.pitch[s + c],
+            self.pitch[2 * s + c], self.pitch[3 * s + c]))
 
     def register_buttons(self):
         # Set up the buttons
@@ -177,6 +204,8 @@ class Sequencer:
         self.counter = 0
         self.selected_output = 0
         self.clock.toggle_edit(False)  # Disable clock edit
+        # Set when leaving the paused state, created for the current loop.
+        self._resume = asyncio.Event()
 
 
     async def start(self):
@@ -184,16 +213,25 @@ class Sequencer:
         self.register_buttons()
         self.reset_state()
 
+        # Bind hot callables once.
+        next_step = self.next_step
+        adjust_step = self.adjust_step
+
         # Main loop.
         while True:
             # Play sequence
             if self.run:
-                self.next_step()
+                next_step()
             # Edit sequence
             elif self.edit:
-                self.adjust_step()
+                adjust_step()
+            # Paused, sleep until play or edit mode is resumed.
+            else:
+                await self._resume.wait()
+                self._resume.clear()
+                continue
 
-            await asyncio.sleep_ms(self.clock.wait_ms())
+            await self.clock.wait()
 
 
 if __name__ == '__main__':
@@ -202,6 +240,8 @@ if __name__ == '__main__':
 
     # Main script function
     async def main():
+        # Collect garbage left from start up before entering the main loop.
+        gc.collect()
         loop = asyncio.get_event_loop()
         loop.create_task(seq.start())
         loop.run_forever()
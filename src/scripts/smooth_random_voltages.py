@@ -24,11 +24,13 @@ digital_1: Trigger on new voltage
 digital_2: Trigger on slew reached target volatge
 digital_3: (state display) on when clocked, off when unclocked
 """
-from random import randint
-from scripts.arpeggiator import DEBUG
+import gc
+from array import array
 
+import micropython
+from micropython import const
 import uasyncio as asyncio
-from utime import ticks_ms
+from utime import ticks_add, ticks_diff, ticks_ms
 
 from lib.clock import Clock
 from lib.constants import UINT_16
@@ -40,10 +42,30 @@ from lib.europi import analog_2
 from lib.europi import digital_1
 from lib.europi import digital_2
 from lib.europi import digital_3
+from lib.helpers import randint16
 from lib.helpers import trigger
+from lib.helpers import percent_to_volts as v
 
 
-DEBUG = False
+DEBUG = const(0)
+
+# Power of two slew rate for each of the 14 knob 2 positions.
+_RATES = array('H', [1 << (i + 1) for i in range(14)])
+
+# Slew steps to run between yields to the scheduler, minus one.
+_YIELD_MASK = const(0x1f)
+
+
+@micropython.viper
+def _slew(v: int, target: int, rate: int) -> int:
+    """Move voltage v towards the target voltage by at most rate."""
+    # Clamp the distance to the target to +/- rate and step by it.
+    d = target - v
+    if d > rate:
+        d = rate
+    elif d < 0 - rate:
+        d = 0 - rate
+    return v + d
 
 
 class SmoothRandomVoltages:
@@ -52,70 +74,92 @@ class SmoothRandomVoltages:
         self.clock = clock
         self.clocked = True
         digital_3.value(1)
-        self.slew_rate = lambda: 1 << knob_2.choice(14) + 1
 
         self.voltage = 0
         self.next_voltage = self.get_next_voltage()
+        self.deadline = ticks_ms()
         self.deadline = self.get_next_deadline()
 
     def get_next_voltage(self):
         """Get next random voltage value."""
-        return randint(0, UINT_16)
+        return randint16()
 
     def get_next_deadline(self):
         """Get the deadline for next clock tick whole note."""
-        return ticks_ms() + (self.clock.wait_ms() * 4)
-
-    def check_next(self):
-        """Check if next voltage conditions and update if ready."""
-        if self.clocked and ticks_ms() < self.deadline:
-            return
-        
-        if not self.clocked and self.voltage != self.next_voltage:
-            return
-    
+        # Advance from the previous deadline so whole notes do not drift.
+        wait_ms = self.clock.refresh() * 4
+        now = ticks_ms()
+        deadline = ticks_add(self.deadline, wait_ms)
+        if ticks_diff(deadline, now) < 0:
+            # Behind schedule, e.g. after unclocked mode, so restart from now.
+            deadline = ticks_add(now, wait_ms)
+        return deadline
+
+    def set_next(self):
+        """Choose the next target voltage and signal the new step."""
         self.next_voltage = self.get_next_voltage()
         self.deadline = self.get_next_deadline()
         trigger(digital_1)  # Trigger on whole note tick.
         digital_2.value(0)  # Gate off on new voltage.
     
     def debug(self):
-        v = lambda v: (v / UINT_16) * 3.3
-        if DEBUG:
-            print("SMOOTH: {:>.2f}  STEPPED: {:>.2f}".format(
-                v(self.voltage), v(self.next_voltage)))
+        print("SMOOTH: {:>.2f}  STEPPED: {:>.2f}".format(
+            v(self.voltage / UINT_16), v(self.next_voltage / UINT_16)))
     
+    @micropython.native
+    def _tick(self):
+        """Advance the smooth voltage by one step and set the outputs."""
+        v = self.voltage
+        nv = self.next_voltage
+
+        # Move to the next voltage on each whole note, or once the slew has
+        # reached the target when unclocked.
+        if self.clocked:
+            ready = ticks_diff(self.deadline, ticks_ms()) <= 0
+        else:
+            ready = v == nv
+        if ready:
+            self.set_next()
+            nv = self.next_voltage
+
+        # Smooth voltage rising or falling, reading the knob 2 slew rate once
+        # per step.
+        if v != nv:
+            v = _slew(v, nv, _RATES[knob_2.choice_int(14)])
+            self.voltage = v
+
+        # Target voltage reached
+        else:
+            digital_2.value(1)  # Gate on slew reached target voltage
+
+        # Set the current smooth / stepped voltage.
+        analog_1.value(v)
+        analog_2.value(nv)
+
+    def toggle_next_voltage_condition(self):
+        """Toggle between clocked and slew complete voltage changes."""
+        self.clocked = not self.clocked
+        digital_3.toggle()
+
     async def start(self):
         # Register button handlers
-        @button_1.handler
-        def toggle_next_voltage_condition():
-            self.clocked = not self.clocked
-            digital_3.toggle()
-
-        # Start the main loop.
-        while True:
-            self.check_next()
+        button_1.handler(self.toggle_next_voltage_condition)
 
-            # Smooth voltage rising
-            if self.voltage < self.next_voltage:
-                self.voltage += self.slew_rate()
-                self.voltage = min(self.voltage, self.next_voltage)
+        # Bind hot callables once.
+        tick = self._tick
+        sleep = asyncio.sleep_ms
 
-            # Smooth voltage falling
-            elif self.voltage > self.next_voltage:
-                self.voltage -= self.slew_rate()
-                self.voltage = max(self.voltage, self.next_voltage)
-            
-            # Target voltage reached
-            elif self.voltage == self.next_voltage:
-                digital_2.value(1)  # Gate on slew reached target voltage
-
-            # Set the current smooth / stepped voltage.
-            analog_1.value(self.voltage)
-            analog_2.value(self.next_voltage)
+        # Start the main loop, yielding to the trigger tasks every few steps
+        # rather than on each one.
+        n = 0
+        while True:
+            tick()
 
-            self.debug()
-            await asyncio.sleep_ms(0)
+            if DEBUG:
+                self.debug()
+            n = (n + 1) & _YIELD_MASK
+            if n == 0:
+                await sleep(0)
 
 
 if __name__ == '__main__':
@@ -124,6 +168,8 @@ if __name__ == '__main__':
 
     # Main script function
     async def main():
+        # Collect garbage left from start up before entering the main loop.
+        gc.collect()
         loop = asyncio.get_event_loop()
         loop.create_task(srv.start())
         loop.run_forever()
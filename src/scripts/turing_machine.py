@@ -26,9 +26,11 @@ digital_2: gate
 digital_3: note changed
 digital_4: sequence reset
 """
+import gc
+from array import array
 from random import choice
-from scripts.arpeggiator import DEBUG
 
+from micropython import const
 import uasyncio as asyncio
 
 from lib.clock import Clock
@@ -41,93 +43,106 @@ from lib.europi import analog_outputs
 from lib.helpers import trigger
 from lib.helpers import randint16
 from lib.helpers import random_chance
-from lib.scales import Scale, scales
+from lib.scales import scales
 
 
-DEBUG = False
+DEBUG = const(0)
 
-
-class TuringStep:
-    pitch1: int
-    pitch2: int
-
-    def __init__(self, scale: Scale):
-        self.pitch_1 = choice(scale.notes)
-        self.pitch_2 = choice(scale.notes)
-
-    def __repr__(self):
-        return "<TuringStep  pitch_1: {}, pitch_2: {}>".format(self.pitch_1, self.pitch_2)
-
-    def play(self, step_duration: int):
-        # Play quantized pitch on Analog 1 & 2.
-        analog_outputs[0].value(self.pitch_1)
-        analog_outputs[1].value(self.pitch_2)
-
-        # Play random notes on Analog 3 & 4.
-        analog_outputs[2].value(randint16())
-        analog_outputs[3].value(randint16())
-
-        #The gate is turned on as this is 'open' the whole time the note is active
-        trigger(digital_outputs[0])
-        trigger(digital_outputs[1], step_duration - 20)
+# Number of steps in the sequence.
+_SEQ_LEN = const(8)
 
 
 class TuringMachine:
-    sequence: list(TuringStep)
+    pitch_1: array
+    pitch_2: array
 
     def __init__(self, clock: Clock):
         self.clock = clock
-        self.sequence =  []
-        self.sequence_length = 8
+        # Quantized pitch of each step for Analog 1 & 2, allocated once and
+        # overwritten in place as notes change.
+        self.pitch_1 = array('H', bytes(2 * _SEQ_LEN))
+        self.pitch_2 = array('H', bytes(2 * _SEQ_LEN))
+        self._scale_idx = 0
         self.scale = scales[0]
         self.step = 0
         self.lock = False
+        self.new_sequence()
+
+    def new_note(self, index: int):
+        """Choose new quantized pitches from the current scale for a step."""
+        notes = self.scale.notes
+        self.pitch_1[index] = choice(notes)
+        self.pitch_2[index] = choice(notes)
+
+    def new_sequence(self):
+        """Fill every step of the sequence with new notes."""
+        for i in range(_SEQ_LEN):
+            self.new_note(i)
+
+    def push_change_scale(self):
+        """Cycle to the next scale."""
+        self._scale_idx = (self._scale_idx + 1) % len(scales)
+        self.scale = scales[self._scale_idx]
+        # Reset sequence to remove notes from previous scale.
+        self.step = 0
+        self.new_sequence()
+
+    def push_lock(self):
+        """Lock or unlock the current sequence."""
+        self.lock = not self.lock
 
     async def start(self):
         # Register button handlers.
-        @button_1.handler
-        def push_change_scale():
-            # Cycle to next scale.
-            i = scales.index(self.scale) + 1
-            if i == len(scales):
-                self.scale = scales[0]
-            else:
-                self.scale = scales[i]
-            # Reset sequence to remove notes from previous scale.
-            self.step = 0
-            self.sequence = [TuringStep(self.scale)]
-
-        @button_2.handler
-        def push_lock():
-            self.lock = not self.lock
+        button_1.handler(self.push_change_scale)
+        button_2.handler(self.push_lock)
+
+        # Bind hot callables once.
+        percent = knob_2.percent
+        wait_ms = self.clock.wait_ms
+        trig = trigger
+        ch = choice
+        a1, a2, a3, a4 = (a.value for a in analog_outputs)
+        d1, d2, d3, d4 = digital_outputs
+        # The pitch arrays are only ever written in place.
+        p1 = self.pitch_1
+        p2 = self.pitch_2
 
         # Increment sequence step, or cycle back to the beginning.
         while True:
-            # The new note can only be swapped out if the sequence has reached its final length, so not for the first x steps.
-            if len(self.sequence) == self.sequence_length:
-                # The note is then dependent on the random chance controlled by knob 2
-                if random_chance(knob_2.percent()):
-                    if self.lock == False:
-                        self.sequence[self.step] = TuringStep(self.scale)
-                        # The jack to indicate a new note has been added is turned on.
-                        trigger(digital_outputs[2])
-            # If the sequence hasn't yet reached its full length, the note is added to the end.
-            else:
-                self.sequence.append(TuringStep(self.scale))
-
-            # Play the current step.
-            self.sequence[self.step].play(self.clock.wait_ms())
+            # The note is swapped out dependent on the random chance controlled by knob 2
+            step = self.step
+            if random_chance(percent()):
+                if self.lock == False:
+                    notes = self.scale.notes
+                    p1[step] = ch(notes)
+                    p2[step] = ch(notes)
+                    # The jack to indicate a new note has been added is turned on.
+                    trig(d3)
+
+            # Play the current step for the duration of a clock tick.
+            # Play quantized pitch on Analog 1 & 2.
+            a1(p1[step])
+            a2(p2[step])
+
+            # Play random notes on Analog 3 & 4.
+            a3(randint16())
+            a4(randint16())
+
+            #The gate is turned on as this is 'open' the whole time the note is active
+            trig(d1)
+            trig(d2, wait_ms() - 20)
 
             if DEBUG:
-                print("step: {} note: {}".format(self.step, self.sequence[self.step]))
+                print("step: {} pitch_1: {} pitch_2: {}".format(
+                    step, p1[step], p2[step]))
 
             # Increment or cycle step.
             self.step += 1
-            if self.step == self.sequence_length:
+            if self.step == _SEQ_LEN:
                 self.step = 0
-                trigger(digital_outputs[3])
+                trig(d4)
 
-            await asyncio.sleep_ms(self.clock.wait_ms())
+            await self.clock.wait()
 
 
 # Run the script if called directly.
@@ -137,6 +152,8 @@ if __name__ == '__main__':
 
     # Main script function
     async def main():
+        # Collect garbage left from start up before entering the main loop.
+        gc.collect()
         loop = asyncio.get_event_loop()
         loop.create_task(turing.start())
         loop.run_forever()